@@ -0,0 +1,8 @@
+"""Load-test / benchmark suite for gateway, products and orders.
+
+Run from ecommerce-backend with every service's requirements installed:
+
+    python -m benchmark.run --scale small --out bench.json
+    python -m benchmark.run --scale small --compare bench.json
+    python -m benchmark.serialization products --rows 10000
+"""
@@ -0,0 +1,195 @@
+"""Synthetic dataset generator.
+
+Each service is populated in its own process (INSTANCE_DIR must point at the
+benchmark data directory before the service is imported):
+
+    INSTANCE_DIR=/tmp/bench/products python -m benchmark.datagen products --scale small
+"""
+import argparse, datetime, os, random
+
+from benchmark import services
+
+SCALES = {
+    "tiny":   dict(products=200,    reviews=3,  users=50,    orders=200),
+    "small":  dict(products=2000,   reviews=5,  users=500,   orders=2000),
+    "medium": dict(products=20000,  reviews=8,  users=5000,  orders=20000),
+    "large":  dict(products=100000, reviews=10, users=20000, orders=100000),
+}
+
+CATEGORIES = ["Audio", "Wearables", "Laptops", "Phones", "Cameras", "Gaming",
+              "Home", "Kitchen", "Books", "Fitness", "Toys", "Fashion"]
+ADJECTIVES = ["Wireless", "Smart", "Portable", "Pro", "Ultra", "Compact", "Classic",
+              "Premium", "Eco", "Mini", "Max", "Lite"]
+NOUNS = ["Headphones", "Watch", "Speaker", "Laptop", "Phone", "Camera", "Controller",
+         "Blender", "Lamp", "Backpack", "Tracker", "Keyboard", "Mouse", "Charger"]
+WORDS = ["great", "battery", "quality", "value", "fast", "sturdy", "light", "bright",
+         "comfortable", "noisy", "cheap", "solid", "delivery", "support", "design"]
+CITIES = [("Bengaluru", "KA"), ("Mumbai", "MH"), ("Chennai", "TN"), ("Pune", "MH"),
+          ("Delhi", "DL"), ("Hyderabad", "TS"), ("Kolkata", "WB")]
+STATUSES = ["Created", "Paid", "Dispatched", "Delivered", "Cancelled"]
+
+USER_PASSWORD = "Bench@1234"
+STOCK = 10**7  # checkout scenarios must never run out
+
+
+def sizes(scale, **overrides):
+    out = dict(SCALES[scale])
+    out.update({k: v for k, v in overrides.items() if v is not None})
+    return out
+
+
+def user_email(i):
+    return f"user{i}@bench.local"
+
+
+def user_id(i):
+    # id 1 is the seeded admin; bench users follow it
+    return i + 1
+
+
+def make_products(rng, n):
+    """Deterministic product rows with ids 1..n (shared by products and orders)."""
+    rows = []
+    for pid in range(1, n + 1):
+        noun = rng.choice(NOUNS)
+        price = rng.randrange(199, 99999)
+        rows.append(dict(
+            id=pid,
+            title=f"{rng.choice(ADJECTIVES)} {noun} {pid}",
+            description=" ".join(rng.choices(WORDS, k=12)) + f" {noun.lower()}",
+            category=rng.choice(CATEGORIES),
+            imageUrl=f"https://picsum.photos/seed/p{pid}/640/480",
+            price=price,
+            oldPrice=price + rng.randrange(0, price // 2 + 1),
+            rating=0, reviews=0,
+            inStock=True, stock=STOCK,
+            delivery=rng.choice(["Tomorrow", "In 2 days", "In 5 days"]),
+        ))
+    return rows
+
+
+def _chunks(rows, size=5000):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def gen_products(n, reviews, users, seed):
+    app = services.load("products")
+    app.migrate()
+    from models import db, Product, Review
+
+    rng = random.Random(seed)
+    products = make_products(rng, n)
+    review_rows = []
+    now = datetime.datetime.utcnow()
+    for p in products:
+        k = rng.randint(0, 2 * reviews)
+        authors = rng.sample(range(1, users + 1), min(k, users))
+        for u in authors:
+            review_rows.append(dict(
+                productId=p["id"], userId=user_id(u), userName=f"User {u}",
+                userEmail=user_email(u), rating=rng.randint(1, 5),
+                comment=" ".join(rng.choices(WORDS, k=8)),
+                createdAt=now - datetime.timedelta(minutes=rng.randrange(525600)),
+            ))
+        if authors:
+            mine = review_rows[-len(authors):]
+            p["rating"] = round(sum(r["rating"] for r in mine) / len(mine), 1)
+            p["reviews"] = len(mine)
+
+    with app.app.app_context():
+        Review.query.delete()
+        Product.query.delete()
+        for chunk in _chunks(products):
+            db.session.execute(db.insert(Product), chunk)
+        for chunk in _chunks(review_rows):
+            db.session.execute(db.insert(Review), chunk)
+        db.session.commit()
+    return dict(products=len(products), reviews=len(review_rows))
+
+
+def gen_orders(n, products, users, seed):
+    app = services.load("orders")
+    app.migrate()
+    from models import db, Order, OrderItem
+
+    catalogue = make_products(random.Random(seed), products)
+    rng = random.Random(seed + 1)
+    now = datetime.datetime.utcnow()
+    orders, items = [], []
+    for oid in range(1, n + 1):
+        u = rng.randint(1, users)
+        city, state = rng.choice(CITIES)
+        lines = rng.sample(catalogue, rng.randint(1, 4))
+        subtotal = 0
+        for p in lines:
+            qty = rng.randint(1, 3)
+            subtotal += p["price"] * qty
+            items.append(dict(orderId=oid, productId=p["id"], title=p["title"],
+                              price=p["price"], qty=qty, imageUrl=p["imageUrl"]))
+        tax = subtotal * 12 // 100
+        orders.append(dict(
+            id=oid, userId=user_id(u), userName=f"User {u}", email=user_email(u),
+            status=rng.choice(STATUSES), method=rng.choice(["card", "upi", "cod"]),
+            coupon=None, subtotal=subtotal, discount=0, shipping=0, tax=tax,
+            total=subtotal + tax,
+            placedAt=now - datetime.timedelta(minutes=rng.randrange(525600)),
+            address_name=f"User {u}", address_phone="9000000000",
+            address_line1=f"{rng.randint(1, 999)} Main Road", address_line2="",
+            address_city=city, address_state=state, address_zip="560001",
+        ))
+
+    with app.app.app_context():
+        OrderItem.query.delete()
+        Order.query.delete()
+        for chunk in _chunks(orders):
+            db.session.execute(db.insert(Order), chunk)
+        for chunk in _chunks(items):
+            db.session.execute(db.insert(OrderItem), chunk)
+        db.session.commit()
+    return dict(orders=len(orders), order_items=len(items))
+
+
+def gen_users(n):
+    app = services.load("gateway")
+    app.migrate()
+    # hash once: scrypt per row would dominate generation time
+    pw_hash = app.generate_password_hash(USER_PASSWORD)
+    now = datetime.datetime.utcnow().isoformat()
+    rows = [(user_id(i), f"User {i}", user_email(i), pw_hash, "user", now)
+            for i in range(1, n + 1)]
+    with app.db() as conn:
+        conn.execute("DELETE FROM users WHERE role != 'admin'")
+        conn.executemany(
+            "INSERT INTO users (id,name,email,password_hash,role,created_at) VALUES (?,?,?,?,?,?)",
+            rows)
+        conn.commit()
+    return dict(users=len(rows))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("service", choices=services.SERVICES)
+    ap.add_argument("--scale", choices=SCALES, default="small")
+    ap.add_argument("--products", type=int)
+    ap.add_argument("--reviews", type=int, help="average reviews per product")
+    ap.add_argument("--users", type=int)
+    ap.add_argument("--orders", type=int)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args(argv)
+    if not os.environ.get("INSTANCE_DIR"):
+        ap.error("INSTANCE_DIR must be set (refusing to overwrite the service's own data)")
+
+    n = sizes(args.scale, products=args.products, reviews=args.reviews,
+              users=args.users, orders=args.orders)
+    if args.service == "products":
+        out = gen_products(n["products"], n["reviews"], n["users"], args.seed)
+    elif args.service == "orders":
+        out = gen_orders(n["orders"], n["products"], n["users"], args.seed)
+    else:
+        out = gen_users(n["users"])
+    print(f"[datagen] {args.service}: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Generate data, start gateway/products/orders locally and run the scenarios.
+
+    python -m benchmark.run --scale small --requests 300 --concurrency 8 --out bench.json
+    python -m benchmark.run --scale small --compare bench.json
+"""
+import argparse, datetime, json, math, os, platform, random, subprocess, sys, tempfile, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmark import datagen, services
+from benchmark.scenarios import SCENARIOS, Context
+
+PORTS = {"products": 18001, "orders": 18002, "gateway": 18000}
+
+
+def _url(service):
+    return f"http://127.0.0.1:{PORTS[service]}"
+
+
+def _env(workdir, service):
+    env = dict(os.environ,
+               INSTANCE_DIR=os.path.join(workdir, service),
+               PRODUCTS_URL=_url("products"),
+               ORDERS_URL=_url("orders"),
+               PYTHONUNBUFFERED="1")
+    os.makedirs(env["INSTANCE_DIR"], exist_ok=True)
+    return env
+
+
+def generate(workdir, args):
+    for svc in services.SERVICES:
+        cmd = [sys.executable, "-m", "benchmark.datagen", svc, "--scale", args.scale,
+               "--seed", str(args.seed)]
+        for k in ("products", "reviews", "users", "orders"):
+            if getattr(args, k) is not None:
+                cmd += [f"--{k}", str(getattr(args, k))]
+        subprocess.run(cmd, cwd=services.BACKEND_DIR, env=_env(workdir, svc), check=True)
+
+
+def start(workdir, gateway_cache=True):
+    procs = []
+    for svc in services.SERVICES:
+        env = _env(workdir, svc)
+        if not gateway_cache:
+            env["GATEWAY_CACHE_TTL"] = "0"
+        log = open(os.path.join(workdir, f"{svc}.log"), "w")
+        procs.append(subprocess.Popen(
+            [sys.executable, "-m", "benchmark.serve", svc, "--port", str(PORTS[svc])],
+            cwd=services.BACKEND_DIR, env=env, stdout=log, stderr=log))
+    deadline = time.time() + 60
+    for svc in services.SERVICES:
+        while True:
+            try:
+                if requests.get(_url(svc) + "/health/ready", timeout=1).ok:
+                    break
+            except requests.RequestException:
+                pass
+            if time.time() > deadline:
+                stop(procs)
+                raise SystemExit(f"{svc} did not become ready; see {workdir}/{svc}.log")
+            time.sleep(0.2)
+    return procs
+
+
+def stop(procs):
+    for p in procs:
+        p.terminate()
+    for p in procs:
+        try:
+            p.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            p.kill()
+
+
+def query_count():
+    return sum(requests.get(_url(svc) + "/_bench/queries").json()["queries"]
+               for svc in services.SERVICES)
+
+
+def login(email, password):
+    r = requests.post(_url("gateway") + "/api/auth/login",
+                      json={"email": email, "password": password})
+    r.raise_for_status()
+    return r.json()["token"]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    # nearest-rank
+    k = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def run_scenario(name, ctx, args):
+    fn = SCENARIOS[name]
+    local = threading.local()
+
+    def op(i):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        rng = random.Random(args.seed * 100003 + i)
+        t0 = time.perf_counter()
+        try:
+            fn(local.session, ctx, rng)
+            err = None
+        except Exception as e:
+            err = str(e)
+        return time.perf_counter() - t0, err
+
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(op, range(-args.warmup, 0)))
+        q0 = query_count()
+        t0 = time.perf_counter()
+        results = list(pool.map(op, range(args.requests)))
+        wall = time.perf_counter() - t0
+        queries = query_count() - q0
+
+    lat = sorted(dt * 1000 for dt, err in results if err is None)
+    errors = [err for _, err in results if err is not None]
+    return {
+        "requests": args.requests,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(args.requests / wall, 2) if wall else None,
+        "latency_ms": {
+            "mean": round(sum(lat) / len(lat), 2) if lat else None,
+            "p50": _r(percentile(lat, 50)),
+            "p95": _r(percentile(lat, 95)),
+            "p99": _r(percentile(lat, 99)),
+            "max": _r(lat[-1] if lat else None),
+        },
+        "db_queries": queries,
+        "db_queries_per_op": round(queries / args.requests, 2),
+    }
+
+
+def _r(v):
+    return None if v is None else round(v, 2)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=services.BACKEND_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        base = json.load(f)
+    print(f"\nvs {baseline_path} (commit {base.get('commit')}):")
+    print(f"{'scenario':<16}{'rps':>20}{'p95 ms':>20}{'queries/op':>20}")
+    for name, cur in current["scenarios"].items():
+        old = base.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        cols = []
+        for a, b in ((old["throughput_rps"], cur["throughput_rps"]),
+                     (old["latency_ms"]["p95"], cur["latency_ms"]["p95"]),
+                     (old["db_queries_per_op"], cur["db_queries_per_op"])):
+            delta = f"{(b - a) / a * 100:+.0f}%" if a else "n/a"
+            cols.append(f"{a}->{b} {delta}")
+        print(f"{name:<16}" + "".join(f"{c:>20}" for c in cols))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scale", choices=datagen.SCALES, default="small")
+    ap.add_argument("--products", type=int)
+    ap.add_argument("--reviews", type=int)
+    ap.add_argument("--users", type=int)
+    ap.add_argument("--orders", type=int)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS),
+                    help="comma separated subset of: " + ", ".join(SCENARIOS))
+    ap.add_argument("--requests", type=int, default=200, help="measured operations per scenario")
+    ap.add_argument("--warmup", type=int, default=20)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--no-gateway-cache", action="store_true",
+                    help="disable the gateway micro-cache so catalogue scenarios hit products")
+    ap.add_argument("--workdir", help="keep generated data and service logs here")
+    ap.add_argument("--out", help="write JSON results to this file")
+    ap.add_argument("--compare", help="baseline JSON to diff against")
+    args = ap.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        ap.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="shop-bench-")
+    sizes = datagen.sizes(args.scale, products=args.products, reviews=args.reviews,
+                          users=args.users, orders=args.orders)
+    print(f"[bench] data in {workdir}: {sizes}")
+    generate(workdir, args)
+
+    procs = start(workdir, gateway_cache=not args.no_gateway_cache)
+    try:
+        admin = login("admin@shop.local", "Admin@123")
+        users = [login(datagen.user_email(i), datagen.USER_PASSWORD)
+                 for i in range(1, min(20, sizes["users"]) + 1)]
+        ctx = Context(_url("gateway"), sizes, admin, users)
+
+        report = {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "concurrency": args.concurrency,
+            "gateway_cache": not args.no_gateway_cache,
+            "scenarios": {},
+        }
+        for name in names:
+            res = report["scenarios"][name] = run_scenario(name, ctx, args)
+            lat = res["latency_ms"]
+            print(f"[bench] {name:<16} {res['throughput_rps']:>8} rps  "
+                  f"p50 {lat['p50']} / p95 {lat['p95']} / p99 {lat['p99']} ms  "
+                  f"{res['db_queries_per_op']} q/op  errors {res['errors']}")
+    finally:
+        stop(procs)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[bench] wrote {args.out}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Scripted user journeys. Each scenario performs one operation through the gateway."""
+from benchmark.datagen import CATEGORIES, NOUNS, USER_PASSWORD, user_email
+
+SORTS = ["relevance", "priceAsc", "priceDesc", "rating", "newest"]
+
+
+class Context:
+    def __init__(self, base, sizes, admin_token, user_tokens):
+        self.base = base
+        self.sizes = sizes
+        self.admin_token = admin_token
+        self.user_tokens = user_tokens
+
+
+def _ok(resp):
+    if resp.status_code >= 400:
+        raise RuntimeError(f"{resp.request.method} {resp.url} -> {resp.status_code}")
+    return resp
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def browse(s, ctx, rng):
+    """Home/search/category listing with pagination and sorting."""
+    params = {"page": rng.randint(1, 5), "pageSize": 20, "sort": rng.choice(SORTS)}
+    roll = rng.random()
+    if roll < 0.3:
+        params["search"] = rng.choice(NOUNS).lower()
+    elif roll < 0.6:
+        params["category"] = rng.choice(CATEGORIES)
+    _ok(s.get(f"{ctx.base}/api/products", params=params))
+
+
+def product_detail(s, ctx, rng):
+    pid = rng.randint(1, ctx.sizes["products"])
+    _ok(s.get(f"{ctx.base}/api/products/{pid}"))
+    _ok(s.get(f"{ctx.base}/api/products/{pid}/reviews"))
+
+
+def login(s, ctx, rng):
+    email = user_email(rng.randint(1, ctx.sizes["users"]))
+    _ok(s.post(f"{ctx.base}/api/auth/login", json={"email": email, "password": USER_PASSWORD}))
+
+
+def checkout(s, ctx, rng):
+    items = [{"id": pid, "qty": rng.randint(1, 2)}
+             for pid in rng.sample(range(1, ctx.sizes["products"] + 1), rng.randint(1, 3))]
+    body = {
+        "items": items,
+        "method": rng.choice(["card", "upi", "cod"]),
+        "address": {"name": "Bench User", "phone": "9000000000", "line1": "1 Main Road",
+                    "city": "Bengaluru", "state": "KA", "pincode": "560001"},
+    }
+    _ok(s.post(f"{ctx.base}/api/orders", json=body, headers=_auth(rng.choice(ctx.user_tokens))))
+
+
+def admin_orders(s, ctx, rng):
+    _ok(s.get(f"{ctx.base}/api/admin/orders", headers=_auth(ctx.admin_token)))
+
+
+SCENARIOS = {
+    "browse": browse,
+    "product_detail": product_detail,
+    "login": login,
+    "checkout": checkout,
+    "admin_orders": admin_orders,
+}
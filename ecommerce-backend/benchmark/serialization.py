@@ -0,0 +1,102 @@
+"""CPU time and peak memory of large list responses: legacy ORM path vs fast path.
+
+    python -m benchmark.serialization products --rows 10000
+    python -m benchmark.serialization orders --rows 10000 --out ser.json
+"""
+import argparse, gc, json, os, tempfile, time, tracemalloc
+
+from benchmark import datagen, services
+
+
+def measure(fn, repeat):
+    from models import db
+    best = None
+    for _ in range(repeat):
+        db.session.remove()
+        gc.collect()
+        t0 = time.process_time()
+        out = fn()
+        dt = time.process_time() - t0
+        best = dt if best is None else min(best, dt)
+    db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, {"cpu_ms": round(best * 1000, 1), "peak_kb": round(peak / 1024), "bytes": len(out)}
+
+
+def product_variants(app, rows):
+    from flask import jsonify
+    from sqlalchemy import desc
+    from models import Product
+
+    def legacy():
+        # what list_products did before: ORM objects, per-row column reflection, stdlib jsonify
+        items = Product.query.order_by(desc(Product.id)).limit(rows).all()
+        body = [{c.name: getattr(p, c.name) for c in p.__table__.columns} for p in items]
+        return jsonify(body).get_data()
+
+    def fast(accept="application/json"):
+        with app.app.test_request_context("/products", query_string={"pageSize": rows},
+                                          headers={"Accept": accept}):
+            return app.list_products().get_data()
+
+    return legacy, fast
+
+
+def order_variants(app, rows):
+    from flask import jsonify
+    from models import Order
+
+    def legacy():
+        # what admin_list did before: ORM objects, one items query per order, stdlib jsonify
+        orders = Order.query.order_by(Order.placedAt.desc()).all()
+        return jsonify([app._to_admin_shape(o) for o in orders]).get_data()
+
+    def fast(accept="application/json"):
+        with app.app.test_request_context("/admin/orders",
+                                          headers={"Accept": accept, "X-User-Role": "admin"}):
+            return app.admin_list().get_data()
+
+    return legacy, fast
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("service", choices=("products", "orders"))
+    ap.add_argument("--rows", type=int, default=10000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", help="write JSON results to this file")
+    args = ap.parse_args(argv)
+
+    os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix=f"ser-bench-{args.service}-")
+    if args.service == "products":
+        datagen.gen_products(args.rows, reviews=0, users=1, seed=42)
+    else:
+        datagen.gen_orders(args.rows, products=1000, users=100, seed=42)
+    app = services.load(args.service)
+    import serialize
+    legacy, fast = (product_variants if args.service == "products" else order_variants)(app, args.rows)
+
+    results = {}
+    with app.app.test_request_context():
+        base, results["legacy"] = measure(legacy, args.repeat)
+        out, results["fast_json"] = measure(fast, args.repeat)
+        assert json.loads(out) == json.loads(base), "fast path output differs from legacy"
+        if serialize.msgpack is not None:
+            _, results["fast_msgpack"] = measure(lambda: fast("application/msgpack"), args.repeat)
+
+    report = {"service": args.service, "rows": args.rows,
+              "json_backend": "orjson" if serialize.orjson else "stdlib", "results": results}
+    for name, r in results.items():
+        print(f"[ser] {args.service} {name:<13} cpu {r['cpu_ms']:>8} ms  "
+              f"peak {r['peak_kb']:>7} KiB  {r['bytes']:>9} bytes")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Run one service with SQL statement counting exposed at GET /_bench/queries.
+
+    INSTANCE_DIR=/tmp/bench/orders python -m benchmark.serve orders --port 18002
+"""
+import argparse, threading
+
+from benchmark import services
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def incr(self, *_):
+        with self._lock:
+            self.value += 1
+
+
+def instrument(service, module, counter):
+    if service == "gateway":
+        # gateway talks to sqlite3 directly through db()
+        connect = module.db
+
+        def counted_db():
+            conn = connect()
+            conn.set_trace_callback(counter.incr)
+            return conn
+        module.db = counted_db
+    else:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.listen(Engine, "before_cursor_execute", counter.incr)
+
+    module.app.add_url_rule("/_bench/queries", "bench_queries",
+                            lambda: {"queries": counter.value})
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("service", choices=services.SERVICES)
+    ap.add_argument("--port", type=int, required=True)
+    args = ap.parse_args(argv)
+
+    module = services.load(args.service)
+    instrument(args.service, module, Counter())
+    module.app.run(host="127.0.0.1", port=args.port, threaded=True, debug=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import os, sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = ("products", "orders", "gateway")
+
+
+def load(service):
+    """Import a service's app module (each service must live in its own process:
+    products and orders both ship top-level `app` / `models` modules)."""
+    sys.path.insert(0, os.path.join(BACKEND_DIR, service))
+    import app
+    return app
@@ -1,8 +1,13 @@
-from flask import Flask, request, jsonify, send_from_directory, Response
+import time
+_T0 = time.perf_counter()
+
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
-import os, json, base64, requests, sqlite3, datetime
+import os, sys, re, json, base64, logging, requests, sqlite3, datetime
 import jwt  
+from urllib.parse import urlencode
 from werkzeug.security import generate_password_hash, check_password_hash
+from microcache import MicroCache, Entry, FetchFailed
 
 PRODUCTS = os.environ.get("PRODUCTS_URL", "http://products:8001")
 ORDERS   = os.environ.get("ORDERS_URL",   "http://orders:8002")
@@ -10,18 +15,34 @@ ORDERS   = os.environ.get("ORDERS_URL",   "http://orders:8002")
 JWT_SECRET = os.environ.get("JWT_SECRET", "dev-secret-change-me")
 JWT_EXPIRES_HOURS = int(os.environ.get("JWT_EXPIRES_HOURS", "24"))
 
+# Micro-cache for anonymous catalogue GETs; GATEWAY_CACHE_TTL=0 disables it
+CATALOGUE_CACHE = MicroCache(
+    ttl=float(os.environ.get("GATEWAY_CACHE_TTL", "5")),
+    swr=float(os.environ.get("GATEWAY_CACHE_SWR", "30")),
+    max_bytes=int(os.environ.get("GATEWAY_CACHE_MAX_MB", "32")) * 1024 * 1024,
+)
+
 BASE_DIR = os.path.dirname(__file__)
-DATA_DIR = os.path.join(BASE_DIR, "instance")
-os.makedirs(DATA_DIR, exist_ok=True)
+DATA_DIR = os.environ.get("INSTANCE_DIR") or os.path.join(BASE_DIR, "instance")
 USERS_DB = os.path.join(DATA_DIR, "users.db")
 
 app = Flask(__name__)
 app.config["UPLOAD_FOLDER"] = os.path.join(BASE_DIR, "uploads")
-os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
 # CORS for API endpoints
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
+# The SSE routes take the JWT as ?access_token=; keep it out of the access log
+class _RedactTokens(logging.Filter):
+    _pattern = re.compile(r"(access_token=)[^&\s\"]+")
+
+    def filter(self, record):
+        record.msg = self._pattern.sub(r"\1[redacted]", record.getMessage())
+        record.args = ()
+        return True
+
+logging.getLogger("werkzeug").addFilter(_RedactTokens())
+
 # ---------------- DB helpers ----------------
 def db():
     conn = sqlite3.connect(USERS_DB)
@@ -50,7 +71,13 @@ def init_users():
             )
         conn.commit()
 
-init_users()
+# One-shot schema + admin seed (`python app.py migrate`); the password hash
+# is deliberately slow, so no worker should pay for it at import time.
+def migrate():
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+    init_users()
+    print(f"[gateway] users DB ready at {USERS_DB}")
 
 # ---------------- JWT helpers ----------------
 def make_token(user_row):
@@ -66,23 +93,27 @@ def make_token(user_row):
     }
     return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
 
-def decode_token_verified():
-    """Verify HS256 token and return claims dict or {}."""
+def _bearer_token():
     auth = request.headers.get("Authorization", "")
     if not auth.startswith("Bearer "):
+        return None
+    return auth.split()[1]
+
+def decode_token_verified(token=None):
+    """Verify HS256 token and return claims dict or {}."""
+    token = token or _bearer_token()
+    if not token:
         return {}
-    token = auth.split()[1]
     try:
         return jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
     except Exception:
         return {}
 
 # fallback: accept old unsigned tokens (only for any legacy sessions)
-def decode_token_legacy():
-    auth = request.headers.get("Authorization", "")
-    if not auth.startswith("Bearer "):
+def decode_token_legacy(token=None):
+    token = token or _bearer_token()
+    if not token:
         return {}
-    token = auth.split()[1]
     parts = token.split(".")
     if len(parts) < 2:
         return {}
@@ -93,11 +124,12 @@ def decode_token_legacy():
     except Exception:
         return {}
 
-def current_user_claims():
-    claims = decode_token_verified()
+def current_user_claims(token=None):
+    """Claims for `token`, or for the Authorization header when none is given."""
+    claims = decode_token_verified(token)
     if claims:
         return claims
-    return decode_token_legacy()
+    return decode_token_legacy(token)
 
 # ---------------- Auth API ----------------
 @app.post("/api/auth/register")
@@ -167,6 +199,7 @@ def upload():
     if not f:
         return jsonify({"message": "file missing"}), 400
     name = f.filename.replace("/", "_")
+    os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
     path = os.path.join(app.config["UPLOAD_FOLDER"], name)
     f.save(path)
     return jsonify({"imageUrl": f"/uploads/{name}"})
@@ -180,26 +213,29 @@ def get_upload_public(name):
     return send_from_directory(app.config["UPLOAD_FOLDER"], name)
 
 # ---------------- Proxy ----------------
-def _forward(target_base: str, strip="/api"):
-    user = current_user_claims()
-    url = target_base + request.full_path.replace(strip, "", 1)
-    if url.endswith("?"):
-        url = url[:-1]
-
-    headers = {k: v for k, v in request.headers.items()
-               if k.lower() not in ("host", "content-length")}
+def _user_headers(headers, user):
     if user:
         headers["X-User-Id"]    = str(user.get("sub") or "")
         headers["X-User-Name"]  = user.get("name") or ""
         headers["X-User-Email"] = user.get("email") or ""
         headers["X-User-Role"]  = user.get("role") or ""
+    return headers
+
+def _forward(target_base: str, strip="/api"):
+    user = current_user_claims()
+    url = target_base + request.path.replace(strip, "", 1)
+    # access_token is only meaningful to the stream routes; never pass it upstream
+    params = [(k, v) for k, v in request.args.items(multi=True) if k != "access_token"]
+
+    headers = _user_headers({k: v for k, v in request.headers.items()
+                             if k.lower() not in ("host", "content-length")}, user)
 
     resp = requests.request(
         method=request.method,
         url=url,
         headers=headers,
         data=request.get_data(),
-        params=request.args,
+        params=params,
         files=request.files if request.files else None,
         stream=True,
     )
@@ -207,14 +243,119 @@ def _forward(target_base: str, strip="/api"):
     headers_out = [(k, v) for k, v in resp.raw.headers.items() if k.lower() not in excluded]
     return Response(resp.content, status=resp.status_code, headers=headers_out)
 
+# same negotiation rule as the upstream services' serialize.respond()
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+CACHE_OFFERED = ("application/json",) + MSGPACK_TYPES
+
+def _cacheable():
+    return (CATALOGUE_CACHE.enabled and request.method == "GET"
+            and not request.headers.get("Authorization"))
+
+def _cache_key():
+    # products treats empty params as absent, so drop them and sort the rest;
+    # the response format depends on Accept (JSON vs MessagePack)
+    args = sorted((k, v) for k, v in request.args.items(multi=True) if v != "")
+    best = request.accept_mimetypes.best_match(CACHE_OFFERED)
+    fmt = "msgpack" if best in MSGPACK_TYPES else "json"
+    return (request.path.rstrip("/"), urlencode(args), fmt)
+
+def _forward_cached(target_base: str, strip="/api"):
+    """Serve anonymous GETs from the micro-cache; identical misses share one upstream call."""
+    key = _cache_key()
+    path, query, fmt = key
+    url = target_base + path.replace(strip, "", 1) + (f"?{query}" if query else "")
+    accept = "application/msgpack" if fmt == "msgpack" else "application/json"
+
+    def fetch():
+        # runs outside the request context for background revalidation
+        resp = requests.get(url, headers={"Accept": accept}, timeout=10)
+        excluded = {"content-encoding", "content-length", "transfer-encoding",
+                    "connection", "keep-alive"}
+        headers_out = [(k, v) for k, v in resp.headers.items() if k.lower() not in excluded]
+        return Entry(resp.status_code, headers_out, resp.content)
+
+    try:
+        entry, state = CATALOGUE_CACHE.get(key, fetch)
+    except (requests.RequestException, FetchFailed):
+        return {"message": "Products service unavailable"}, 502
+    out = Response(entry.body, status=entry.status, headers=entry.headers)
+    out.headers["X-Cache"] = state
+    return out
+
+def _purge_catalogue(rest):
+    """Drop cached listings plus the touched product after a write through the gateway."""
+    pid = (rest or "").split("/")[0]
+    prefix = f"/api/products/{pid}" if pid else None
+    CATALOGUE_CACHE.purge(lambda key: key[0] == "/api/products"
+                          or (prefix is not None and (key[0] == prefix or key[0].startswith(prefix + "/"))))
+
+def _stream(target_base: str, user, strip="/api"):
+    """Relay a server-sent event stream chunk by chunk instead of buffering it."""
+    if not user:
+        return {"message": "Unauthorized"}, 401
+    url = target_base + request.path.replace(strip, "", 1)
+    headers = _user_headers({"Accept": "text/event-stream"}, user)
+    try:
+        # no read timeout: the upstream sends heartbeats and the stream is long-lived
+        resp = requests.get(url, headers=headers, stream=True, timeout=(5, None))
+    except requests.RequestException:
+        return {"message": "Orders service unavailable"}, 502
+    if resp.status_code != 200:
+        return Response(resp.content, status=resp.status_code,
+                        content_type=resp.headers.get("Content-Type"))
+
+    def relay():
+        try:
+            for chunk in resp.iter_content(chunk_size=None):
+                yield chunk
+        finally:
+            resp.close()
+
+    return Response(stream_with_context(relay()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.get("/api/health")
 def health():
     return {"ok": True}
 
+@app.get("/health/live")
+def live():
+    return {"ok": True, "startupMs": STARTUP_MS}
+
+@app.get("/health/ready")
+def ready():
+    checks = {}
+    try:
+        with db() as conn:
+            conn.execute("SELECT 1 FROM users LIMIT 1")
+        checks["db"] = "ok"
+    except sqlite3.Error as e:
+        checks["db"] = str(e)
+    for name, base in (("products", PRODUCTS), ("orders", ORDERS)):
+        try:
+            r = requests.get(f"{base}/health/live", timeout=2)
+            checks[name] = "ok" if r.status_code == 200 else f"HTTP {r.status_code}"
+        except requests.RequestException as e:
+            checks[name] = str(e)
+    ok = all(v == "ok" for v in checks.values())
+    return {"ok": ok, **checks}, 200 if ok else 503
+
 @app.route("/api/products", methods=["GET", "POST", "OPTIONS"])
 @app.route("/api/products/<path:rest>", methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"])
 def products_proxy(rest=None):
-    return _forward(PRODUCTS)
+    if _cacheable():
+        return _forward_cached(PRODUCTS)
+    resp = _forward(PRODUCTS)
+    if request.method in ("POST", "PATCH", "DELETE") and resp.status_code < 400:
+        _purge_catalogue(rest)
+    return resp
+
+@app.get("/api/orders/stream")
+@app.get("/api/admin/orders/stream")
+def orders_stream():
+    # EventSource cannot set headers, so only these routes accept ?access_token=
+    token = request.args.get("access_token")
+    return _stream(ORDERS, current_user_claims(token))
 
 @app.route("/api/orders", methods=["GET", "POST", "OPTIONS"])
 @app.route("/api/orders/<path:rest>", methods=["GET", "PATCH", "OPTIONS"])
@@ -222,5 +363,11 @@ def products_proxy(rest=None):
 def orders_proxy(rest=None):
     return _forward(ORDERS)
 
+STARTUP_MS = round((time.perf_counter() - _T0) * 1000, 1)
+print(f"[gateway] loaded in {STARTUP_MS} ms")
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    if sys.argv[1:2] == ["migrate"]:
+        migrate()
+    else:
+        app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)
@@ -0,0 +1,114 @@
+import threading, time
+from collections import OrderedDict
+
+ENTRY_OVERHEAD = 256  # rough per-entry bookkeeping cost counted against the budget
+
+
+class Entry:
+    __slots__ = ("status", "headers", "body", "size", "fresh_until", "stale_until")
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.size = len(body) + sum(len(k) + len(v) for k, v in headers) + ENTRY_OVERHEAD
+        self.fresh_until = self.stale_until = 0.0
+
+
+class FetchFailed(Exception):
+    """Raised in requests that waited on a leader whose upstream fetch failed."""
+
+
+class _Flight:
+    """One upstream fetch that concurrent identical misses wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+        self.error = None
+
+
+class MicroCache:
+    """Short-TTL shared response cache with single-flight and stale-while-revalidate.
+
+    Entries are fresh for `ttl` seconds, then served stale for up to `swr`
+    more seconds while one background fetch refreshes them. Total size is
+    bounded by `max_bytes` with least-recently-used eviction.
+    """
+
+    def __init__(self, ttl, swr, max_bytes, wait_timeout=30):
+        self.ttl = ttl
+        self.swr = swr
+        self.max_bytes = max_bytes
+        self.wait_timeout = wait_timeout
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._bytes = 0
+        self._gen = 0     # bumped by purge() so in-flight fetches can't re-store purged data
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def get(self, key, fetch):
+        """Return (entry, state); `fetch()` must return an Entry and is only
+        called by the single leader of a miss or refresh."""
+        now = time.monotonic()
+        with self._lock:
+            e = self._entries.get(key)
+            if e is not None and now < e.stale_until:
+                self._entries.move_to_end(key)
+                if now < e.fresh_until:
+                    return e, "HIT"
+                if key not in self._flights:
+                    flight = self._flights[key] = _Flight()
+                    threading.Thread(target=self._lead, args=(key, fetch, flight, self._gen),
+                                     daemon=True).start()
+                return e, "STALE"
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            gen = self._gen
+
+        if leader:
+            self._lead(key, fetch, flight, gen)
+            if flight.error is not None:
+                raise flight.error
+            return flight.entry, "MISS"
+        if not flight.done.wait(self.wait_timeout):
+            return fetch(), "BYPASS"
+        if flight.error is not None:
+            # each waiter gets its own exception; the leader's is shared state
+            raise FetchFailed(f"upstream fetch failed: {flight.error!r}") from flight.error
+        return flight.entry, "COALESCED"
+
+    def purge(self, match=None):
+        """Drop entries whose key satisfies `match` (all entries if None)."""
+        with self._lock:
+            self._gen += 1
+            for key in [k for k in self._entries if match is None or match(k)]:
+                self._bytes -= self._entries.pop(key).size
+
+    def _lead(self, key, fetch, flight, gen):
+        try:
+            flight.entry = fetch()
+        except Exception as e:
+            flight.error = e
+        with self._lock:
+            self._flights.pop(key, None)
+            e = flight.entry
+            if e is not None and e.status == 200 and gen == self._gen \
+                    and e.size <= self.max_bytes // 8:
+                now = time.monotonic()
+                e.fresh_until = now + self.ttl
+                e.stale_until = e.fresh_until + self.swr
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self._bytes -= old.size
+                self._entries[key] = e
+                self._bytes += e.size
+                while self._bytes > self.max_bytes:
+                    self._bytes -= self._entries.popitem(last=False)[1].size
+        flight.done.set()
@@ -0,0 +1,73 @@
+import pytest
+
+
+class FakeResponse:
+    status_code = 200
+    content = b"[]"
+    headers = {"Content-Type": "application/json"}
+
+    class raw:
+        headers = {"Content-Type": "application/json"}
+
+    def iter_content(self, chunk_size=None):
+        yield b": ping\n\n"
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def admin_token(gateway):
+    return gateway.make_token({"id": 1, "name": "Admin", "email": "admin@shop.local", "role": "admin"})
+
+
+@pytest.fixture
+def upstream(gateway, monkeypatch):
+    calls = []
+
+    def fake_request(**kwargs):
+        calls.append((kwargs["url"], kwargs))
+        return FakeResponse()
+
+    def fake_get(url, **kwargs):
+        calls.append((url, kwargs))
+        return FakeResponse()
+
+    monkeypatch.setattr(gateway.requests, "request", fake_request)
+    monkeypatch.setattr(gateway.requests, "get", fake_get)
+    return calls
+
+
+def test_query_token_is_ignored_outside_stream_routes(gateway, admin_token):
+    c = gateway.app.test_client()
+    r = c.get(f"/api/auth/me?access_token={admin_token}", headers={"Accept": "text/event-stream"})
+    assert r.status_code == 401
+    r = c.get("/api/auth/me", headers={"Authorization": f"Bearer {admin_token}"})
+    assert r.status_code == 200 and r.json["role"] == "admin"
+
+
+def test_forward_does_not_authenticate_or_pass_query_token(gateway, admin_token, upstream):
+    c = gateway.app.test_client()
+    c.patch(f"/api/orders/1?access_token={admin_token}&x=1",
+            headers={"Accept": "text/event-stream"}, json={"status": "Paid"})
+    url, kwargs = upstream[0]
+    assert url.endswith("/orders/1") and "access_token" not in url
+    assert kwargs["params"] == [("x", "1")]
+    assert "X-User-Role" not in kwargs["headers"]
+
+
+def test_stream_route_accepts_query_token(gateway, admin_token, upstream):
+    c = gateway.app.test_client()
+    r = c.get(f"/api/admin/orders/stream?access_token={admin_token}",
+              headers={"Accept": "text/event-stream"})
+    assert r.status_code == 200
+    assert r.get_data() == b": ping\n\n"
+    url, kwargs = upstream[0]
+    assert url.endswith("/admin/orders/stream")
+    assert kwargs["headers"]["X-User-Role"] == "admin"
+
+
+def test_stream_route_without_token_is_unauthorized(gateway, upstream):
+    r = gateway.app.test_client().get("/api/orders/stream")
+    assert r.status_code == 401
+    assert upstream == []
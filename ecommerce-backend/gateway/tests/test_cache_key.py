@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.mark.parametrize("accept, fmt", [
+    (None, "json"),
+    ("*/*", "json"),
+    ("application/msgpack", "msgpack"),
+    ("application/json, application/msgpack;q=0", "json"),
+    ("application/json;q=0.5, application/x-msgpack", "msgpack"),
+])
+def test_cache_key_negotiates_like_upstream(gateway, accept, fmt):
+    headers = {"Accept": accept} if accept else {}
+    with gateway.app.test_request_context("/api/products/", query_string="sort=rating&search=&page=2",
+                                          headers=headers):
+        assert gateway._cache_key() == ("/api/products", "page=2&sort=rating", fmt)
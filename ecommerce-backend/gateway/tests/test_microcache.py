@@ -0,0 +1,316 @@
+import threading, time
+
+import pytest
+
+import microcache
+from microcache import Entry, FetchFailed, MicroCache, ENTRY_OVERHEAD
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class DeferredThread:
+    """Stands in for threading.Thread so background refreshes run when the test says."""
+    started = []
+
+    def __init__(self, target, args=(), daemon=None):
+        self.target, self.args = target, args
+
+    def start(self):
+        DeferredThread.started.append(self)
+
+    def run(self):
+        self.target(*self.args)
+
+
+class CountingEvent(threading.Event):
+    """Event that reports how many threads are blocked in wait()."""
+
+    def __init__(self):
+        super().__init__()
+        self.waiting = 0
+        self._count_lock = threading.Lock()
+
+    def wait(self, timeout=None):
+        with self._count_lock:
+            self.waiting += 1
+        return super().wait(timeout)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(microcache.time, "monotonic", c)
+    return c
+
+
+@pytest.fixture
+def deferred(monkeypatch):
+    DeferredThread.started = []
+    monkeypatch.setattr(microcache.threading, "Thread", DeferredThread)
+    return DeferredThread.started
+
+
+def entry(body=b"x", status=200):
+    return Entry(status, [("Content-Type", "application/json")], body)
+
+
+def fetcher(*results):
+    """fetch() returning (or raising) `results` in order and recording each call."""
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        r = results[len(calls) - 1]
+        if isinstance(r, Exception):
+            raise r
+        return r
+    fetch.calls = calls
+    return fetch
+
+
+def assert_accounted(cache):
+    assert cache._bytes == sum(e.size for e in cache._entries.values())
+    assert cache._bytes <= cache.max_bytes
+
+
+def wait_for(cond, timeout=5):
+    deadline = time.time() + timeout
+    while not cond():
+        assert time.time() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_miss_then_hit_until_ttl(clock):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    first = entry(b"one")
+    fetch = fetcher(first)
+
+    assert cache.get("k", fetch) == (first, "MISS")
+    clock.now += 4.9
+    assert cache.get("k", fetch) == (first, "HIT")
+    assert len(fetch.calls) == 1
+
+
+def test_non_200_is_returned_but_not_stored(clock):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    fetch = fetcher(entry(b"nope", status=404), entry(b"nope", status=404))
+
+    assert cache.get("k", fetch)[1] == "MISS"
+    assert cache.get("k", fetch)[1] == "MISS"
+    assert len(fetch.calls) == 2
+    assert cache._bytes == 0
+
+
+def test_waiters_share_the_leaders_fetch(clock):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    release = threading.Event()
+    result = entry(b"shared")
+
+    def slow_fetch():
+        release.wait(5)
+        return result
+
+    waiter_fetch = fetcher()  # any call would IndexError: waiters must not fetch
+    leader_out, waiter_out = [], []
+    leader = threading.Thread(target=lambda: leader_out.append(cache.get("k", slow_fetch)))
+    leader.start()
+    wait_for(lambda: "k" in cache._flights)
+    flight = cache._flights["k"]
+    flight.done = CountingEvent()
+
+    waiters = [threading.Thread(target=lambda: waiter_out.append(cache.get("k", waiter_fetch)))
+               for _ in range(3)]
+    for t in waiters:
+        t.start()
+    wait_for(lambda: flight.done.waiting == 3)
+    release.set()
+    for t in [leader] + waiters:
+        t.join(5)
+
+    assert leader_out == [(result, "MISS")]
+    assert waiter_out == [(result, "COALESCED")] * 3
+    assert waiter_fetch.calls == []
+    assert cache._flights == {}
+
+
+def test_waiter_bypasses_cache_after_timeout(clock):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20, wait_timeout=0)
+    stuck = cache._flights["k"] = microcache._Flight()  # a leader that never finishes
+    own = entry(b"own")
+    fetch = fetcher(own)
+
+    assert cache.get("k", fetch) == (own, "BYPASS")
+    assert len(fetch.calls) == 1
+    assert cache._flights["k"] is stuck
+    assert "k" not in cache._entries
+
+
+def test_leader_error_reaches_every_waiter(clock):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    flight = cache._flights["k"] = microcache._Flight()
+    flight.done = CountingEvent()
+    errors = []
+
+    def waiter():
+        try:
+            cache.get("k", fetcher())
+        except Exception as e:
+            errors.append(e)
+
+    waiters = [threading.Thread(target=waiter) for _ in range(3)]
+    for t in waiters:
+        t.start()
+    wait_for(lambda: flight.done.waiting == 3)
+    boom = ConnectionError("upstream down")
+    cache._lead("k", fetcher(boom), flight, cache._gen)
+    for t in waiters:
+        t.join(5)
+
+    assert len(errors) == 3
+    assert all(isinstance(e, FetchFailed) and e.__cause__ is boom for e in errors)
+    assert len({id(e) for e in errors}) == 3
+    assert cache._flights == {} and cache._entries == {}
+
+
+def test_leader_reraises_its_own_error(clock):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    boom = ConnectionError("upstream down")
+    with pytest.raises(ConnectionError) as info:
+        cache.get("k", fetcher(boom))
+    assert info.value is boom
+    assert cache._flights == {}
+
+    # the failure isn't cached; the next request leads a fresh fetch
+    ok = entry()
+    assert cache.get("k", fetcher(ok)) == (ok, "MISS")
+
+
+def test_stale_entry_served_while_one_refresh_runs(clock, deferred):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    old, new = entry(b"old"), entry(b"new")
+    cache.get("k", fetcher(old))
+    clock.now += 6
+
+    refresh = fetcher(new)
+    assert cache.get("k", refresh) == (old, "STALE")
+    assert cache.get("k", refresh) == (old, "STALE")
+    assert len(deferred) == 1 and refresh.calls == []
+
+    deferred[0].run()
+    assert cache.get("k", fetcher()) == (new, "HIT")
+    assert len(refresh.calls) == 1
+    assert_accounted(cache)
+    assert len(cache._entries) == 1
+
+
+def test_failed_refresh_keeps_stale_entry_and_retries(clock, deferred):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    old, new = entry(b"old"), entry(b"new")
+    cache.get("k", fetcher(old))
+    clock.now += 6
+
+    assert cache.get("k", fetcher(ConnectionError("down"))) == (old, "STALE")
+    deferred[0].run()
+    assert cache._flights == {}
+
+    assert cache.get("k", fetcher(new)) == (old, "STALE")
+    deferred[1].run()
+    assert cache.get("k", fetcher()) == (new, "HIT")
+
+
+def test_expired_past_swr_is_a_miss(clock, deferred):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    cache.get("k", fetcher(entry(b"old")))
+    clock.now += 35
+    new = entry(b"new")
+
+    assert cache.get("k", fetcher(new)) == (new, "MISS")
+    assert deferred == []
+    assert_accounted(cache)
+
+
+def test_purge_during_fetch_is_not_stored(clock):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    fetched = entry(b"pre-write")
+
+    def fetch_racing_a_write():
+        cache.purge()
+        return fetched
+
+    # the caller still gets its response, but it must not repopulate the cache
+    assert cache.get("k", fetch_racing_a_write) == (fetched, "MISS")
+    assert cache._entries == {} and cache._flights == {}
+    fresh = entry(b"post-write")
+    assert cache.get("k", fetcher(fresh)) == (fresh, "MISS")
+    assert cache.get("k", fetcher()) == (fresh, "HIT")
+
+
+def test_purge_during_background_refresh_drops_the_result(clock, deferred):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    cache.get("k", fetcher(entry(b"old")))
+    clock.now += 6
+
+    cache.get("k", fetcher(entry(b"pre-write")))
+    cache.purge()
+    deferred[0].run()
+
+    assert cache._entries == {}
+    assert cache._bytes == 0
+
+
+def test_purge_with_match_keeps_others(clock):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=1 << 20)
+    for key in ("a1", "a2", "b1"):
+        cache.get(key, fetcher(entry(key.encode())))
+
+    cache.purge(lambda k: k.startswith("a"))
+
+    assert list(cache._entries) == ["b1"]
+    assert_accounted(cache)
+
+
+def test_lru_eviction_keeps_byte_count(clock):
+    size = entry(b"0" * 100).size
+    cache = MicroCache(ttl=5, swr=30, max_bytes=size * 8)
+    for i in range(8):
+        cache.get(i, fetcher(entry(b"%d" % i * 100)))
+    cache.get(0, fetcher())  # touch 0 so 1 is least recently used
+
+    cache.get(8, fetcher(entry(b"8" * 100)))
+
+    assert list(cache._entries) == [2, 3, 4, 5, 6, 7, 0, 8]
+    assert_accounted(cache)
+
+    # replacing a key must not double count it
+    clock.now += 40
+    cache.get(0, fetcher(entry(b"0" * 10)))
+    assert_accounted(cache)
+    assert len(cache._entries) == 8
+
+    cache.purge()
+    assert cache._bytes == 0
+
+
+def test_oversized_entry_is_served_not_stored(clock):
+    cache = MicroCache(ttl=5, swr=30, max_bytes=8 * (ENTRY_OVERHEAD + 200))
+    big = entry(b"x" * 1000)
+    assert cache.get("big", fetcher(big)) == (big, "MISS")
+    assert cache._entries == {} and cache._bytes == 0
+
+
+def test_gateway_maps_upstream_failure_to_502(gateway, monkeypatch):
+    def down(url, **kwargs):
+        raise gateway.requests.ConnectionError("refused")
+    monkeypatch.setattr(gateway.requests, "get", down)
+    gateway.CATALOGUE_CACHE.purge()
+
+    resp = gateway.app.test_client().get("/api/products")
+
+    assert resp.status_code == 502
+    assert gateway.CATALOGUE_CACHE._flights == {}
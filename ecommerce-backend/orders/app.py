@@ -1,7 +1,13 @@
-from flask import Flask, request
+import time
+_T0 = time.perf_counter()
+
+from flask import Flask, request, Response
 from flask_cors import CORS
 from models import db, Order, OrderItem
-import requests, math, os
+from events import order_events
+from serialize import respond
+from collections import defaultdict
+import requests, math, os, sys
 
 # Use env override in Docker; default to products service DNS name
 PRODUCTS = os.environ.get("PRODUCTS_URL", "http://products:8001")
@@ -11,18 +17,19 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 
 # ---- Absolute DB path ----
 BASE_DIR = os.path.dirname(__file__)
-INSTANCE_DIR = os.path.join(BASE_DIR, "instance")
-os.makedirs(INSTANCE_DIR, exist_ok=True)
+INSTANCE_DIR = os.environ.get("INSTANCE_DIR") or os.path.join(BASE_DIR, "instance")
 DB_PATH = os.path.join(INSTANCE_DIR, "orders.db")
 
 app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{DB_PATH}"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 db.init_app(app)
 
-# Create tables at startup (Flask 3 safe)
-with app.app_context():
-    db.create_all()
-    print(f"[orders] DB ready at {DB_PATH}; PRODUCTS_URL={PRODUCTS}")
+# One-shot schema creation (`python app.py migrate`), not at import time
+def migrate():
+    os.makedirs(INSTANCE_DIR, exist_ok=True)
+    with app.app_context():
+        db.create_all()
+        print(f"[orders] DB ready at {DB_PATH}; PRODUCTS_URL={PRODUCTS}")
 
 def _user():
     return {
@@ -62,18 +69,32 @@ def _release_stock(lines):
         except Exception:
             pass
 
+def _publish(o: Order):
+    """Push a changed order to everyone streaming it (owner + admins)."""
+    items = OrderItem.query.filter_by(orderId=o.id).all()
+    order_events.publish({
+        "userId": o.userId,
+        "email": o.email,
+        "shop": _to_shop_shape(o, items),
+        "admin": _to_admin_shape(o, items),
+    })
+
+def _sse(sub):
+    return Response(order_events.stream(sub), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.get("/orders")
 def my_orders():
     u = _user()
     if not (u["email"] or u["id"]):
         return {"message": "Unauthorized"}, 401
-    rows = (
-        Order.query
-        .filter((Order.email == u["email"]) | (Order.userId == u["id"]))
+    rows = db.session.execute(
+        db.select(*ORDER_COLUMNS)
+        .where((Order.email == u["email"]) | (Order.userId == u["id"]))
         .order_by(Order.placedAt.desc())
-        .all()
-    )
-    return [_to_shop_shape(o) for o in rows]
+    ).all()
+    items = _items_for([o.id for o in rows])
+    return respond([_to_shop_shape(o, items[o.id]) for o in rows])
 
 @app.post("/orders")
 def create_order():
@@ -160,8 +181,29 @@ def create_order():
         db.session.rollback()
         return {"message": "Could not create order"}, 500
 
+    _publish(o)
     return _to_shop_shape(o), 201
 
+@app.get("/orders/stream")
+def my_orders_stream():
+    """SSE feed of the caller's orders as they change (replaces polling GET /orders)."""
+    u = _user()
+    if not (u["email"] or u["id"]):
+        return {"message": "Unauthorized"}, 401
+
+    return _sse(order_events.subscribe(_owner_match(u)))
+
+def _owner_match(u):
+    """Subscriber filter: pass only the caller's own orders, in shop shape."""
+    def match(ev):
+        mine = (u["email"] and ev["email"] == u["email"]) or \
+               (u["id"] and str(ev["userId"]) == u["id"])
+        return ev["shop"] if mine else None
+    return match
+
+def _admin_match(ev):
+    return ev["admin"]
+
 @app.patch("/orders/<int:oid>")
 def patch_order(oid):
     u = _user()
@@ -179,6 +221,7 @@ def patch_order(oid):
         _release_stock([{"productId": it.productId, "qty": it.qty} for it in items])
         o.status = "Cancelled"
         db.session.commit()
+        _publish(o)
         return {"ok": True}
 
     # admin status update
@@ -187,6 +230,7 @@ def patch_order(oid):
             return {"message": "Forbidden"}, 403
         o.status = data["status"]
         db.session.commit()
+        _publish(o)
         return {"ok": True}
 
     return {"message": "Bad request"}, 400
@@ -195,27 +239,57 @@ def patch_order(oid):
 def admin_list():
     if _user()["role"] != "admin":
         return {"message": "Forbidden"}, 403
-    rows = Order.query.order_by(Order.placedAt.desc()).all()
-    return [_to_admin_shape(o) for o in rows]
+    rows = db.session.execute(
+        db.select(*ORDER_COLUMNS).order_by(Order.placedAt.desc())
+    ).all()
+    items = _items_for([o.id for o in rows])
+    return respond([_to_admin_shape(o, items[o.id]) for o in rows])
+
+@app.get("/admin/orders/stream")
+def admin_stream():
+    if _user()["role"] != "admin":
+        return {"message": "Forbidden"}, 403
+    return _sse(order_events.subscribe(_admin_match))
 
 # -------- shape helpers to match your frontend --------
-def _to_shop_shape(o: Order):
-    items = OrderItem.query.filter_by(orderId=o.id).all()
+# List endpoints select these as plain row tuples (rows and ORM objects both
+# expose the same attribute names) and load every order's items in batches
+# instead of one query per order.
+ORDER_COLUMNS = tuple(Order.__table__.columns)
+ITEM_COLUMNS = (OrderItem.orderId, OrderItem.productId, OrderItem.title,
+                OrderItem.price, OrderItem.qty, OrderItem.imageUrl)
+IN_BATCH = 500  # stay well under sqlite's bound-parameter limit
+
+def _items_for(order_ids):
+    by_order = defaultdict(list)
+    for i in range(0, len(order_ids), IN_BATCH):
+        rows = db.session.execute(
+            db.select(*ITEM_COLUMNS)
+            .where(OrderItem.orderId.in_(order_ids[i:i + IN_BATCH]))
+            .order_by(OrderItem.id)
+        ).all()
+        for it in rows:
+            by_order[it.orderId].append(it)
+    return by_order
+
+def _item_shape(it):
+    return {
+        "id": it.productId,
+        "title": it.title,
+        "price": it.price,
+        "qty": it.qty,
+        "imageUrl": it.imageUrl,
+    }
+
+def _to_shop_shape(o: Order, items=None):
+    if items is None:
+        items = OrderItem.query.filter_by(orderId=o.id).all()
     return {
         "id": o.id,
         "userId": o.userId,
         "userName": o.userName,
         "email": o.email,
-        "items": [
-            {
-                "id": it.productId,
-                "title": it.title,
-                "price": it.price,
-                "qty": it.qty,
-                "imageUrl": it.imageUrl,
-            }
-            for it in items
-        ],
+        "items": [_item_shape(it) for it in items],
         "totals": {
             "subtotal": o.subtotal,
             "discount": o.discount,
@@ -238,23 +312,15 @@ def _to_shop_shape(o: Order):
         },
     }
 
-def _to_admin_shape(o: Order):
-    items = OrderItem.query.filter_by(orderId=o.id).all()
+def _to_admin_shape(o: Order, items=None):
+    if items is None:
+        items = OrderItem.query.filter_by(orderId=o.id).all()
     return {
         "id": o.id,
         "userId": o.userId,
         "userName": o.userName,
         "email": o.email,
-        "items": [
-            {
-                "id": it.productId,
-                "title": it.title,
-                "price": it.price,
-                "qty": it.qty,
-                "imageUrl": it.imageUrl,
-            }
-            for it in items
-        ],
+        "items": [_item_shape(it) for it in items],
         "amount": o.total,
         "status": o.status,
         "createdAt": o.placedAt.isoformat(),
@@ -270,5 +336,33 @@ def _to_admin_shape(o: Order):
         "payment": {"method": o.method.upper()},
     }
 
+# -------- probes --------
+@app.get("/health/live")
+def live():
+    return {"ok": True, "startupMs": STARTUP_MS}
+
+@app.get("/health/ready")
+def ready():
+    checks, ok = {}, True
+    try:
+        db.session.execute(db.select(Order.id).limit(1))
+        checks["db"] = "ok"
+    except Exception as e:
+        db.session.rollback()
+        checks["db"], ok = str(e), False
+    try:
+        r = requests.get(f"{PRODUCTS}/health/live", timeout=2)
+        checks["products"] = "ok" if r.status_code == 200 else f"HTTP {r.status_code}"
+    except Exception as e:
+        checks["products"] = str(e)
+    ok = ok and checks["products"] == "ok"
+    return {"ok": ok, **checks}, 200 if ok else 503
+
+STARTUP_MS = round((time.perf_counter() - _T0) * 1000, 1)
+print(f"[orders] loaded in {STARTUP_MS} ms")
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8002, debug=True)
+    if sys.argv[1:2] == ["migrate"]:
+        migrate()
+    else:
+        app.run(host="0.0.0.0", port=8002, debug=True, threaded=True)
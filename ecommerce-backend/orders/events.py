@@ -0,0 +1,61 @@
+import json, queue, threading
+
+# Per-subscriber queue bound: a client that falls this far behind is dropped
+# and will re-sync with a full fetch when its EventSource reconnects.
+QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+
+
+class Subscription:
+    def __init__(self, match):
+        self.match = match            # callable(event) -> payload or None
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.closed = False
+
+
+class OrderEvents:
+    """In-process pub/sub for order changes; one bounded queue per subscriber."""
+
+    def __init__(self):
+        self._subs = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, match):
+        sub = Subscription(match)
+        with self._lock:
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        sub.closed = True
+        with self._lock:
+            self._subs.discard(sub)
+
+    def publish(self, event):
+        with self._lock:
+            subs = list(self._subs)
+        for sub in subs:
+            payload = sub.match(event)
+            if payload is None:
+                continue
+            try:
+                sub.queue.put_nowait(payload)
+            except queue.Full:
+                self.unsubscribe(sub)
+
+    def stream(self, sub):
+        """Yield SSE frames for a subscription until the client goes away."""
+        try:
+            yield "retry: 3000\n\n"
+            while not sub.closed:
+                try:
+                    payload = sub.queue.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: order\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+
+order_events = OrderEvents()
@@ -0,0 +1,36 @@
+from flask import request, Response
+import json
+
+# Optional fast backends; stdlib json is the fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+OFFERED = ("application/json",) + (MSGPACK_TYPES if msgpack is not None else ())
+
+
+def dumps(body):
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body, separators=(",", ":")).encode()
+
+
+def negotiate():
+    """Response type from the Accept header (q-values honoured); JSON by default."""
+    best = request.accept_mimetypes.best_match(OFFERED)
+    return "application/msgpack" if best in MSGPACK_TYPES else "application/json"
+
+
+def respond(body, status=200, headers=None):
+    """Encode with MessagePack when the client prefers it, JSON otherwise."""
+    mimetype = negotiate()
+    data = msgpack.packb(body) if mimetype == "application/msgpack" else dumps(body)
+    resp = Response(data, status=status, mimetype=mimetype, headers=headers)
+    resp.vary.add("Accept")
+    return resp
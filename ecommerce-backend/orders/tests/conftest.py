@@ -0,0 +1,23 @@
+import importlib.util, os, sys, tempfile
+
+import pytest
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+
+def load_app():
+    """Import orders/app.py under its own name so it can't clash with the
+    gateway's or products' top-level `app` module in a shared pytest run."""
+    os.environ.setdefault("INSTANCE_DIR", tempfile.mkdtemp(prefix="orders-test-"))
+    if "orders_app" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("orders_app", os.path.join(SERVICE_DIR, "app.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["orders_app"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["orders_app"]
+
+
+@pytest.fixture
+def orders_app():
+    return load_app()
@@ -0,0 +1,107 @@
+import queue
+
+import pytest
+
+import events
+from events import OrderEvents
+
+
+def _event(oid, user_id, email):
+    return {
+        "userId": user_id,
+        "email": email,
+        "shop": {"id": oid, "shape": "shop"},
+        "admin": {"id": oid, "shape": "admin"},
+    }
+
+
+def _user(uid, email, role=""):
+    return {"id": uid, "name": "x", "email": email, "role": role}
+
+
+def _drain(sub):
+    out = []
+    while True:
+        try:
+            out.append(sub.queue.get_nowait())
+        except queue.Empty:
+            return out
+
+
+@pytest.fixture
+def bus():
+    return OrderEvents()
+
+
+def test_publish_reaches_only_matching_subscribers(bus):
+    evens = bus.subscribe(lambda ev: ev if ev["n"] % 2 == 0 else None)
+    every = bus.subscribe(lambda ev: ev)
+    for n in range(4):
+        bus.publish({"n": n})
+    assert [e["n"] for e in _drain(evens)] == [0, 2]
+    assert [e["n"] for e in _drain(every)] == [0, 1, 2, 3]
+
+
+def test_owner_never_receives_other_users_orders(bus, orders_app):
+    app = orders_app
+    alice = bus.subscribe(app._owner_match(_user("2", "alice@shop.local")))
+    bob = bus.subscribe(app._owner_match(_user("3", "bob@shop.local")))
+    admin = bus.subscribe(app._admin_match)
+
+    bus.publish(_event(1, 2, "alice@shop.local"))
+    bus.publish(_event(2, 3, "bob@shop.local"))
+    bus.publish(_event(3, None, "alice@shop.local"))   # matched by email only
+    bus.publish(_event(4, 2, "renamed@shop.local"))    # matched by user id only
+
+    assert _drain(alice) == [{"id": 1, "shape": "shop"}, {"id": 3, "shape": "shop"},
+                             {"id": 4, "shape": "shop"}]
+    assert _drain(bob) == [{"id": 2, "shape": "shop"}]
+    assert _drain(admin) == [{"id": n, "shape": "admin"} for n in (1, 2, 3, 4)]
+
+
+def test_anonymous_identity_matches_nothing(bus, orders_app):
+    app = orders_app
+    anon = bus.subscribe(app._owner_match(_user(None, "")))
+    bus.publish(_event(1, None, ""))
+    bus.publish(_event(2, 2, "alice@shop.local"))
+    assert _drain(anon) == []
+
+
+def test_full_queue_drops_only_the_slow_subscriber(bus, monkeypatch):
+    monkeypatch.setattr(events, "QUEUE_SIZE", 3)
+    slow = bus.subscribe(lambda ev: ev)
+    for n in range(3):
+        bus.publish({"n": n})
+    fast = bus.subscribe(lambda ev: ev)
+
+    bus.publish({"n": 3})  # overflows slow's queue
+
+    assert slow.closed
+    assert slow not in bus._subs
+    assert fast in bus._subs and not fast.closed
+    assert _drain(fast) == [{"n": 3}]
+    bus.publish({"n": 4})
+    assert [e["n"] for e in _drain(slow)] == [0, 1, 2]  # nothing delivered after the drop
+
+
+def test_stream_ends_for_dropped_subscriber_and_cleans_up(bus):
+    sub = bus.subscribe(lambda ev: ev)
+    frames = bus.stream(sub)
+    assert next(frames) == "retry: 3000\n\n"
+    bus.publish({"id": 7})
+    assert next(frames) == 'event: order\ndata: {"id": 7}\n\n'
+    bus.unsubscribe(sub)
+    with pytest.raises(StopIteration):
+        next(frames)
+    assert sub not in bus._subs
+
+
+def test_closing_the_stream_unsubscribes(bus):
+    sub = bus.subscribe(lambda ev: ev)
+    frames = bus.stream(sub)
+    next(frames)
+    frames.close()  # client disconnected
+    assert sub.closed
+    assert sub not in bus._subs
+    bus.publish({"id": 1})
+    assert _drain(sub) == []
@@ -1,16 +1,19 @@
-from flask import Flask, request, jsonify, make_response
+import time
+_T0 = time.perf_counter()
+
+from flask import Flask, request
 from flask_cors import CORS
-from models import db, Product, Review
+from models import db, Product, Review, PRODUCT, REVIEW
+from serialize import respond
 from sqlalchemy import or_, desc, asc, func
-import os
+import os, sys
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
 # ---- Absolute DB path (prevents sqlite path issues) ----
 BASE_DIR = os.path.dirname(__file__)
-INSTANCE_DIR = os.path.join(BASE_DIR, "instance")
-os.makedirs(INSTANCE_DIR, exist_ok=True)
+INSTANCE_DIR = os.environ.get("INSTANCE_DIR") or os.path.join(BASE_DIR, "instance")
 DB_PATH = os.path.join(INSTANCE_DIR, "products.db")
 
 app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{DB_PATH}"
@@ -32,15 +35,15 @@ def seed():
         db.session.add(Product(**p))
     db.session.commit()
 
-# Flask 3: do one-time init explicitly
-def init_db():
+# One-shot schema + seed (`python app.py migrate`); kept out of import so
+# every worker boots without touching the DB.
+def migrate():
+    os.makedirs(INSTANCE_DIR, exist_ok=True)
     with app.app_context():
         db.create_all()
         seed()
         print(f"[products] DB ready at {DB_PATH}")
 
-init_db()
-
 def _is_admin():
     return (request.headers.get("X-User-Role") or "").lower() == "admin"
 
@@ -62,34 +65,35 @@ def list_products():
     page = int(request.args.get("page") or 1)
     size = int(request.args.get("pageSize") or 20)
 
-    qry = Product.query
+    conds = [Product.price.between(minP, maxP), Product.rating >= minR]
     if q:
-        qry = qry.filter(or_(Product.title.ilike(f"%{q}%"),
-                             Product.description.ilike(f"%{q}%")))
+        conds.append(or_(Product.title.ilike(f"%{q}%"),
+                         Product.description.ilike(f"%{q}%")))
     if cat:
-        qry = qry.filter(Product.category == cat)
-    qry = qry.filter(Product.price.between(minP, maxP),
-                     Product.rating >= minR)
-
-    if sort == "priceAsc":   qry = qry.order_by(asc(Product.price))
-    elif sort == "priceDesc":qry = qry.order_by(desc(Product.price))
-    elif sort == "newest":   qry = qry.order_by(desc(Product.id))
-    elif sort == "rating":   qry = qry.order_by(desc(Product.rating))
-    else:                    qry = qry.order_by(desc(Product.id))
-
-    total = qry.count()
-    items = qry.offset((page-1)*size).limit(size).all()
-    body = [p.to_dict() for p in items]
-    resp = make_response(jsonify(body))
-    resp.headers["X-Total-Count"] = str(total)
-    resp.headers["X-Page"] = str(page)
-    resp.headers["X-Page-Size"] = str(size)
-    return resp
+        conds.append(Product.category == cat)
+
+    if sort == "priceAsc":   order = asc(Product.price)
+    elif sort == "priceDesc":order = desc(Product.price)
+    elif sort == "newest":   order = desc(Product.id)
+    elif sort == "rating":   order = desc(Product.rating)
+    else:                    order = desc(Product.id)
+
+    total = db.session.scalar(db.select(func.count(Product.id)).where(*conds))
+    # plain row tuples, not ORM objects: no identity map / attribute instrumentation
+    rows = db.session.execute(
+        db.select(*PRODUCT.columns).where(*conds).order_by(order)
+        .offset((page-1)*size).limit(size)
+    ).all()
+    return respond(PRODUCT.rows(rows), headers={
+        "X-Total-Count": str(total),
+        "X-Page": str(page),
+        "X-Page-Size": str(size),
+    })
 
 @app.get("/products/<int:pid>")
 def get_product(pid):
     p = Product.query.get_or_404(pid)
-    return p.to_dict()
+    return respond(p.to_dict())
 
 @app.post("/products")
 def create_product():
@@ -124,8 +128,11 @@ def delete_product(pid):
 @app.get("/products/<int:pid>/reviews")
 def reviews(pid):
     _ = Product.query.get_or_404(pid)
-    rows = Review.query.filter_by(productId=pid).order_by(Review.createdAt.desc()).all()
-    return [r.to_dict() for r in rows]
+    rows = db.session.execute(
+        db.select(*REVIEW.columns).where(Review.productId == pid)
+        .order_by(Review.createdAt.desc())
+    ).all()
+    return respond(REVIEW.rows(rows))
 
 @app.post("/products/<int:pid>/reviews")
 def add_review(pid):
@@ -188,5 +195,25 @@ def increment_stock(pid: int):
     db.session.commit()
     return {"ok": True, "stock": p.stock}
 
+# ---------- Probes ----------
+@app.get("/health/live")
+def live():
+    return {"ok": True, "startupMs": STARTUP_MS}
+
+@app.get("/health/ready")
+def ready():
+    try:
+        db.session.execute(db.select(Product.id).limit(1))
+    except Exception as e:
+        db.session.rollback()
+        return {"ok": False, "db": str(e)}, 503
+    return {"ok": True, "db": "ok"}
+
+STARTUP_MS = round((time.perf_counter() - _T0) * 1000, 1)
+print(f"[products] loaded in {STARTUP_MS} ms")
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8001, debug=True)
+    if sys.argv[1:2] == ["migrate"]:
+        migrate()
+    else:
+        app.run(host="0.0.0.0", port=8001, debug=True)
@@ -1,5 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from serialize import Encoder
 
 db = SQLAlchemy()
 
@@ -18,7 +19,7 @@ class Product(db.Model):
     delivery    = db.Column(db.String(80), default="Tomorrow")
 
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return PRODUCT.obj(self)
 
 class Review(db.Model):
     id        = db.Column(db.Integer, primary_key=True)
@@ -31,6 +32,8 @@ class Review(db.Model):
     createdAt = db.Column(db.DateTime, default=datetime.utcnow)
 
     def to_dict(self):
-        d = {c.name: getattr(self, c.name) for c in self.__table__.columns}
-        d["createdAt"] = d["createdAt"].isoformat()
-        return d
+        return REVIEW.obj(self)
+
+# Encoders are built once here rather than reflecting over columns per row
+PRODUCT = Encoder(Product)
+REVIEW  = Encoder(Review, convert={"createdAt": datetime.isoformat})
@@ -0,0 +1,70 @@
+from flask import request, Response
+import json, operator
+
+# Optional fast backends; stdlib json is the fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+OFFERED = ("application/json",) + (MSGPACK_TYPES if msgpack is not None else ())
+
+
+class Encoder:
+    """Row -> dict encoder built once per model (no per-row column reflection).
+
+    `columns` can be passed straight to db.select() so list endpoints fetch
+    plain row tuples instead of full ORM objects.
+    """
+
+    def __init__(self, model, convert=None):
+        convert = convert or {}
+        self.keys = tuple(c.name for c in model.__table__.columns)
+        self.columns = tuple(getattr(model, k) for k in self.keys)
+        self._convert = tuple((i, convert[k]) for i, k in enumerate(self.keys) if k in convert)
+        if len(self.keys) == 1:
+            # attrgetter with a single name returns a scalar, not a 1-tuple
+            key = self.keys[0]
+            self._get = lambda o: (getattr(o, key),)
+        else:
+            self._get = operator.attrgetter(*self.keys)
+
+    def row(self, values):
+        if self._convert:
+            values = list(values)
+            for i, fn in self._convert:
+                if values[i] is not None:
+                    values[i] = fn(values[i])
+        return dict(zip(self.keys, values))
+
+    def rows(self, result):
+        return [self.row(r) for r in result]
+
+    def obj(self, o):
+        return self.row(self._get(o))
+
+
+def dumps(body):
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body, separators=(",", ":")).encode()
+
+
+def negotiate():
+    """Response type from the Accept header (q-values honoured); JSON by default."""
+    best = request.accept_mimetypes.best_match(OFFERED)
+    return "application/msgpack" if best in MSGPACK_TYPES else "application/json"
+
+
+def respond(body, status=200, headers=None):
+    """Encode with MessagePack when the client prefers it, JSON otherwise."""
+    mimetype = negotiate()
+    data = msgpack.packb(body) if mimetype == "application/msgpack" else dumps(body)
+    resp = Response(data, status=status, mimetype=mimetype, headers=headers)
+    resp.vary.add("Accept")
+    return resp
@@ -0,0 +1,22 @@
+import importlib.util, os, sys
+
+import pytest
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_module(name):
+    """Import a products module under a prefixed name so it can't clash with
+    the same-named modules of the other services in a shared pytest run."""
+    key = f"products_{name}"
+    if key not in sys.modules:
+        spec = importlib.util.spec_from_file_location(key, os.path.join(SERVICE_DIR, f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[key] = module
+        spec.loader.exec_module(module)
+    return sys.modules[key]
+
+
+@pytest.fixture
+def serialize():
+    return load_module("serialize")
@@ -0,0 +1,67 @@
+import datetime, os
+
+import pytest
+from flask import Flask
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class OnlyId(Base):
+    __tablename__ = "only_id"
+    id = Column(Integer, primary_key=True)
+
+
+class Thing(Base):
+    __tablename__ = "thing"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    createdAt = Column(DateTime)
+
+
+def test_encoder_single_column_model(serialize):
+    enc = serialize.Encoder(OnlyId)
+    assert enc.keys == ("id",)
+    assert enc.obj(OnlyId(id=5)) == {"id": 5}
+    assert enc.rows([(1,), (2,)]) == [{"id": 1}, {"id": 2}]
+
+
+def test_encoder_converts_and_skips_none(serialize):
+    enc = serialize.Encoder(Thing, convert={"createdAt": datetime.datetime.isoformat})
+    at = datetime.datetime(2024, 1, 2, 3, 4, 5)
+    assert enc.obj(Thing(id=1, name="a", createdAt=at)) == \
+        {"id": 1, "name": "a", "createdAt": "2024-01-02T03:04:05"}
+    assert enc.row((2, "b", None)) == {"id": 2, "name": "b", "createdAt": None}
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, "application/json"),
+    ("*/*", "application/json"),
+    ("text/html", "application/json"),
+    ("application/msgpack", "application/msgpack"),
+    ("application/x-msgpack", "application/msgpack"),
+    ("application/json, application/msgpack;q=0", "application/json"),
+    ("application/msgpack;q=0.5, application/json", "application/json"),
+    ("application/json;q=0.5, application/msgpack", "application/msgpack"),
+])
+def test_respond_honours_q_values(serialize, accept, expected):
+    if serialize.msgpack is None and expected == "application/msgpack":
+        expected = "application/json"
+    headers = {"Accept": accept} if accept else {}
+    with Flask(__name__).test_request_context(headers=headers):
+        resp = serialize.respond([{"id": 1}])
+    assert resp.mimetype == expected
+    assert "Accept" in resp.vary
+
+
+def test_orders_copy_of_respond_stays_in_sync():
+    # each service image builds from its own directory, so the helpers are copied
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def shared_part(service):
+        with open(os.path.join(here, "..", service, "serialize.py")) as f:
+            src = f.read()
+        return src[src.index("def dumps("):]
+
+    assert shared_part("products") == shared_part("orders")
@@ -1,7 +1,7 @@
-import { Component } from '@angular/core';
+import { Component, OnDestroy, OnInit } from '@angular/core';
 import { FormBuilder } from '@angular/forms';
-import { Observable, combineLatest } from 'rxjs';
-import { debounceTime, map, startWith } from 'rxjs/operators';
+import { Observable, Subject, combineLatest } from 'rxjs';
+import { debounceTime, map, startWith, takeUntil } from 'rxjs/operators';
 import { AdminOrdersService, Order, OrderStatus } from '../../services/admin-orders.service';
 
 @Component({
@@ -9,7 +9,9 @@ import { AdminOrdersService, Order, OrderStatus } from '../../services/admin-ord
   templateUrl: './orders.component.html',
   styleUrls: ['./orders.component.scss']
 })
-export class AdminOrdersComponent {
+export class AdminOrdersComponent implements OnInit, OnDestroy {
+  private destroy$ = new Subject<void>();
+
   // --- filters ---
   q      = this.fb.control('');
   status = this.fb.control<'All' | OrderStatus>('All');
@@ -97,6 +99,15 @@ export class AdminOrdersComponent {
 
   constructor(private fb: FormBuilder, public svc: AdminOrdersService) {}
 
+  ngOnInit(): void {
+    // live order updates only while this page is open
+    this.svc.live$.pipe(takeUntil(this.destroy$)).subscribe();
+  }
+
+  ngOnDestroy(): void {
+    this.destroy$.next(); this.destroy$.complete();
+  }
+
   open(o: Order) { this.selected = o; }
   close() { this.selected = null; }
 
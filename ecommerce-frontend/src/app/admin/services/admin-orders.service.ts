@@ -1,7 +1,9 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
-import { BehaviorSubject } from 'rxjs';
-import { tap } from 'rxjs/operators';
+import { BehaviorSubject, EMPTY, Observable, of } from 'rxjs';
+import { catchError, concatMap, finalize, map, switchMap, tap } from 'rxjs/operators';
+import { AuthService } from '../../auth/services/auth.service';
+import { EventStreamService, upsertById } from '../../core/services/event-stream.service';
 import { environment } from '../../../environments/environment';
 
 export type OrderStatus = 'Created' | 'Paid' | 'Dispatched' | 'Delivered' | 'Cancelled';
@@ -37,9 +39,30 @@ export class AdminOrdersService {
   private _orders = new BehaviorSubject<Order[]>([]);
   readonly orders$ = this._orders.asObservable();
 
-  constructor(private http: HttpClient) {
-    this.refresh();
-  }
+  // Subscribe while the orders page is open. The stream only runs for a signed-in
+  // admin; it is closed and the cached list cleared on logout or unsubscribe.
+  readonly live$: Observable<unknown> = this.auth.user$.pipe(
+    switchMap(u => {
+      if (u?.role !== 'admin') {
+        this._orders.next([]);
+        return EMPTY;
+      }
+      return this.stream.listen<Order>(`${API}/admin/orders/stream`, 'order').pipe(
+        // snapshot on every (re)open; pushes queue behind it so none are overwritten
+        concatMap(ev => ev.kind === 'resync'
+          ? this.http.get<Order[]>(`${API}/admin/orders`).pipe(map(list => (_: Order[]) => list || []))
+          : of((list: Order[]) => upsertById(list, ev.data))),
+        tap(apply => this._orders.next(apply(this._orders.value))),
+        catchError(() => {
+          this.refresh();
+          return EMPTY;
+        })
+      );
+    }),
+    finalize(() => this._orders.next([]))
+  );
+
+  constructor(private http: HttpClient, private stream: EventStreamService, private auth: AuthService) {}
 
   refresh() {
     this.http.get<Order[]>(`${API}/admin/orders`).subscribe(list => this._orders.next(list || []));
@@ -47,7 +70,6 @@ export class AdminOrdersService {
 
   updateStatus(id: string | number, status: OrderStatus) {
     this.http.patch(`${API}/orders/${id}`, { status })
-      .pipe(tap(() => this.refresh()))
       .subscribe({ error: () => {} });
   }
 }
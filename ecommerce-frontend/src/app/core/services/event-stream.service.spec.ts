@@ -0,0 +1,22 @@
+import { TestBed } from '@angular/core/testing';
+
+import { EventStreamService, upsertById } from './event-stream.service';
+
+describe('EventStreamService', () => {
+  let service: EventStreamService;
+
+  beforeEach(() => {
+    TestBed.configureTestingModule({});
+    service = TestBed.inject(EventStreamService);
+  });
+
+  it('should be created', () => {
+    expect(service).toBeTruthy();
+  });
+
+  it('upsertById replaces existing items and prepends new ones', () => {
+    const list = [{ id: 2, v: 'a' }, { id: 1, v: 'b' }];
+    expect(upsertById(list, { id: 1, v: 'c' })).toEqual([{ id: 2, v: 'a' }, { id: 1, v: 'c' }]);
+    expect(upsertById(list, { id: 3, v: 'd' })[0]).toEqual({ id: 3, v: 'd' });
+  });
+});
@@ -0,0 +1,41 @@
+import { Injectable, NgZone } from '@angular/core';
+import { Observable } from 'rxjs';
+
+// 'resync' is emitted every time the stream (re)opens, including the first time:
+// callers take their full snapshot then, so nothing pushed before or while the
+// stream was down is lost. The observable errors once the browser gives up on
+// the stream (e.g. 401 after the token expired).
+export type StreamEvent<T> = { kind: 'resync' } | { kind: 'data'; data: T };
+
+export function upsertById<T extends { id: any }>(list: T[], item: T): T[] {
+  const i = list.findIndex(x => String(x.id) === String(item.id));
+  if (i < 0) return [item, ...list];
+  const out = list.slice();
+  out[i] = item;
+  return out;
+}
+
+@Injectable({ providedIn: 'root' })
+export class EventStreamService {
+  constructor(private zone: NgZone) {}
+
+  listen<T>(url: string, event = 'message'): Observable<StreamEvent<T>> {
+    return new Observable<StreamEvent<T>>(sub => {
+      // EventSource cannot send an Authorization header; the gateway accepts the token as a query param
+      const token = sessionStorage.getItem('token');
+      const src = new EventSource(token ? `${url}?access_token=${encodeURIComponent(token)}` : url);
+
+      src.onopen = () => this.zone.run(() => sub.next({ kind: 'resync' }));
+      src.onerror = () => {
+        if (src.readyState === EventSource.CLOSED) {
+          this.zone.run(() => sub.error(new Error(`event stream closed: ${url}`)));
+        }
+      };
+      src.addEventListener(event, (e: MessageEvent) => {
+        this.zone.run(() => sub.next({ kind: 'data', data: JSON.parse(e.data) as T }));
+      });
+
+      return () => src.close();
+    });
+  }
+}
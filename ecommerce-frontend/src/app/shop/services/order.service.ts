@@ -1,10 +1,11 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
-import { map } from 'rxjs/operators';
-import { Observable } from 'rxjs';
+import { catchError, concatMap, map, scan } from 'rxjs/operators';
+import { Observable, of } from 'rxjs';
 
 import { Address, Order, PaymentMethod } from '../models/cart';
 import { CartService } from './cart.service';
+import { EventStreamService, upsertById } from '../../core/services/event-stream.service';
 import { environment } from '../../../environments/environment';
 
 const API = environment.apiBase;
@@ -14,6 +15,7 @@ export class OrderService {
   constructor(
     private http: HttpClient,
     private cart: CartService,
+    private stream: EventStreamService,
   ) {}
 
   create$(address: Address, method: PaymentMethod): Observable<Order> {
@@ -22,10 +24,20 @@ export class OrderService {
     return this.http.post<Order>(`${API}/orders`, { items, address, method, coupon });
   }
 
-  myOrders$: Observable<Order[]> = this.http.get<Order[]>(`${API}/orders`).pipe(
+  private fetchMine$: Observable<Order[]> = this.http.get<Order[]>(`${API}/orders`).pipe(
     map(list => list || [])
   );
 
+  // full fetch each time the SSE stream (re)opens, then only the changed orders it pushes;
+  // falls back to a single fetch if the stream is unavailable
+  myOrders$: Observable<Order[]> = this.stream.listen<Order>(`${API}/orders/stream`, 'order').pipe(
+    concatMap(ev => ev.kind === 'resync'
+      ? this.fetchMine$.pipe(map(list => (_: Order[]) => list))
+      : of((list: Order[]) => upsertById(list, ev.data))),
+    scan((list: Order[], apply: (l: Order[]) => Order[]) => apply(list), []),
+    catchError(() => this.fetchMine$)
+  );
+
   cancel$(orderId: number | string): Observable<{ ok: boolean }> {
     return this.http.patch<{ ok: boolean }>(`${API}/orders/${orderId}`, { action: 'cancel' });
   }